@@ -20,12 +20,8 @@ import click
 
 from script_generator import ScriptGenerator
 import config_openrouter
+from logging_config import setup_logging
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger('batch_script_generator')
 
 class BatchScriptGenerator:
@@ -212,8 +208,7 @@ def main(directory: str, output_dir: str, model: str, concurrent: int,
     
     DIRECTORY: Directory to search for thread JSON files (default: current directory)
     """
-    if verbose:
-        logging.getLogger().setLevel(logging.DEBUG)
+    setup_logging(logging.DEBUG if verbose else logging.INFO)
     
     async def run_batch():
         try:
@@ -233,8 +228,9 @@ def main(directory: str, output_dir: str, model: str, concurrent: int,
             if not output_dir:
                 output_dir = config_openrouter.DEFAULT_SCRIPT_OUTPUT_DIR
             
-            # Process files
-            results = await batch_gen.process_batch(thread_files, output_dir, concurrent)
+            # Process files, sharing one client connection pool across the batch
+            async with batch_gen.generator:
+                results = await batch_gen.process_batch(thread_files, output_dir, concurrent)
             
             # Generate and display report
             report = batch_gen.generate_report(results)
@@ -15,6 +15,9 @@ APIFY_API_TOKEN = os.getenv("APIFY_API_TOKEN")
 DEFAULT_REPLY_LIMIT = 50
 DEFAULT_OUTPUT_DIR = "output"  # Base directory for all downloaded content
 
+# Maximum number of concurrent yt-dlp requests to X.com (keeps parallel downloads under rate limits)
+DOWNLOAD_CONCURRENCY = max(1, int(os.getenv("X_DL_CONCURRENCY", "4")))
+
 # Apify actor IDs
 TWITTER_SCRAPER_ACTOR_ID = "u6ppkMWAx2E2MpEuF"  # For fetching tweets
 TWITTER_REPLIES_SCRAPER_ACTOR_ID = "qhybbvlFivx7AP0Oh"  # For fetching replies
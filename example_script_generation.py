@@ -67,7 +67,8 @@ async def main():
         generator = ScriptGenerator()
         
         # Process the thread file
-        output_path = await generator.process_thread_file(demo_file)
+        async with generator:
+            output_path = await generator.process_thread_file(demo_file)
         
         if output_path:
             print(f"✅ Script generated successfully!")
@@ -0,0 +1,30 @@
+"""
+Logging configuration for the x-thread-dl tool.
+Library modules only create named loggers; each command-line entry point
+calls setup_logging() once.
+"""
+
+import logging
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+def setup_logging(level: int = logging.INFO):
+    """
+    Configure the root logger for a command-line entry point.
+
+    Args:
+        level (int): The log level for the root logger and its handlers (default: logging.INFO).
+    """
+    logging.basicConfig(level=level, format=LOG_FORMAT)
+    # Apply the level even if logging was already configured (e.g. --verbose after import)
+    root = logging.getLogger()
+    root.setLevel(level)
+    for handler in root.handlers:
+        handler.setLevel(level)
+
+    # The log format does not use thread, process or source-location fields, so skip
+    # collecting them (sys._getframe walks, os.getpid) for every record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    logging._srcfile = None
@@ -25,12 +25,8 @@ from scraper import Scraper
 from thread_parser import parse_tweet_and_replies_data # Updated import
 from video_downloader import save_parsed_thread_data  # Updated import, was video_downloader
 from script_generator import ScriptGenerator
+from logging_config import setup_logging
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO, # Default to INFO
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger('x-thread-dl')
 
 @click.command()
@@ -57,10 +53,8 @@ def main(tweet_url: str, reply_limit: int, output_dir: str, apify_token: Optiona
 
     TWEET_URL: The URL of the initial tweet in the thread.
     """
+    setup_logging(logging.DEBUG if verbose else logging.INFO)
     if verbose:
-        logging.getLogger().setLevel(logging.DEBUG) # Set root logger to DEBUG
-        for handler in logging.getLogger().handlers: # Ensure all handlers also respect DEBUG
-            handler.setLevel(logging.DEBUG)
         logger.debug("Verbose mode enabled. All loggers set to DEBUG.")
     else:
         # Ensure other loggers (like apify_client) are not overly verbose if not in verbose mode
@@ -172,7 +166,8 @@ async def generate_tiktok_script_automatically(thread_dir: str, openrouter_key:
 
         # Generate script in the same directory as the thread
         script_output_dir = os.path.join(thread_dir, "scripts")
-        result = await generator.process_thread_file(thread_json_path, script_output_dir)
+        async with generator:
+            result = await generator.process_thread_file(thread_json_path, script_output_dir)
 
         if result:
             logger.info(f"✅ TikTok script generated: {result}")
@@ -200,18 +195,20 @@ def generate_script(json_file_path: str, output_dir: Optional[str], model: Optio
 
     JSON_FILE_PATH: Path to the JSON file containing scraped thread data.
     """
+    setup_logging(logging.DEBUG if verbose else logging.INFO)
     if verbose:
-        logging.getLogger().setLevel(logging.DEBUG)
-        for handler in logging.getLogger().handlers:
-            handler.setLevel(logging.DEBUG)
         logger.debug("Verbose mode enabled for script generation.")
 
     try:
         # Initialize script generator
         generator = ScriptGenerator(api_key=openrouter_key, model=model)
 
-        # Process the thread file
-        result = asyncio.run(generator.process_thread_file(json_file_path, output_dir))
+        # Process the thread file, closing the client's connections afterwards
+        async def run_generation():
+            async with generator:
+                return await generator.process_thread_file(json_file_path, output_dir)
+
+        result = asyncio.run(run_generation())
 
         if result:
             logger.info(f"Successfully generated TikTok script: {result}")
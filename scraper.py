@@ -12,13 +12,11 @@ from apify_client import ApifyClient
 # Import configuration
 import config
 
-# Set up logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger('x-thread-dl.scraper')
 
+# Pattern to match tweet IDs in X.com (Twitter) URLs
+_TWEET_ID_URL_RE = re.compile(r'(?:twitter\.com|x\.com)/\w+/status/(\d+)')
+
 class Scraper:
     """Class for scraping tweets and replies from X.com (Twitter)."""
 
@@ -70,7 +68,7 @@ class Scraper:
             }
 
             # Use a separate thread for the blocking API call
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             run = await loop.run_in_executor(
                 None,
                 lambda: self.client.actor(config.TWITTER_SCRAPER_ACTOR_ID).call(run_input=input_data)
@@ -123,7 +121,7 @@ class Scraper:
             }
 
             # Use a separate thread for the blocking API call
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             run = await loop.run_in_executor(
                 None,
                 lambda: self.client.actor(config.TWITTER_REPLIES_SCRAPER_ACTOR_ID).call(run_input=input_data)
@@ -143,11 +141,12 @@ class Scraper:
             logger.info(f"Successfully fetched {len(dataset_items)} replies from URL: {url}")
 
             # Debug: Log the keys of each reply object to diagnose tweet ID extraction issues
-            for i, reply in enumerate(dataset_items):
-                logger.debug(f"Reply {i} keys: {list(reply.keys())}")
-                # Debug: Log the full structure of the first reply to help diagnose author extraction issues
-                if i == 0:
-                    logger.debug(f"Reply 0 full structure: {reply}")
+            if logger.isEnabledFor(logging.DEBUG):
+                for i, reply in enumerate(dataset_items):
+                    logger.debug("Reply %d keys: %s", i, list(reply.keys()))
+                    # Debug: Log the full structure of the first reply to help diagnose author extraction issues
+                    if i == 0:
+                        logger.debug("Reply 0 full structure: %s", reply)
 
             return dataset_items
 
@@ -259,15 +258,13 @@ class Scraper:
             Optional[str]: The tweet ID or None if extraction failed
         """
         try:
-            # Pattern to match tweet IDs in X.com (Twitter) URLs
-            pattern = r'(?:twitter\.com|x\.com)/\w+/status/(\d+)'
-            match = re.search(pattern, url)
+            match = _TWEET_ID_URL_RE.search(url)
 
             if match:
                 return match.group(1)
 
             # Log the URL and pattern when no match is found
-            logger.debug(f"No tweet ID found in URL: {url} using pattern: {pattern}")
+            logger.debug(f"No tweet ID found in URL: {url} using pattern: {_TWEET_ID_URL_RE.pattern}")
 
             return None
         except Exception as e:
@@ -12,13 +12,27 @@ import logging
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 import httpx
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 import config_openrouter
+from utils import first_present, load_json_bytes, dump_json_bytes
 
 # Set up logging
 logger = logging.getLogger('x-thread-dl.script_generator')
 
+# Fields that may hold a tweet's text, checked in priority order
+_TWEET_TEXT_KEYS = ('text', 'replyText', 'full_text', 'content')
+
+# Request pieces that are identical for every generation, built once
+_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are an expert TikTok content creator. Always respond with valid JSON."
+}
+_GENERATION_PARAMS = {
+    "temperature": 0.7,
+    "max_tokens": 2000
+}
+
 class ScriptGenerator:
     """Generates TikTok scripts from Twitter thread content using OpenRouter API."""
 
@@ -36,14 +50,25 @@ class ScriptGenerator:
         if not self.api_key:
             raise ValueError("OpenRouter API key is required. Set OPENROUTER_API_KEY environment variable.")
 
-        # Initialize OpenAI client with OpenRouter endpoint
-        self.client = OpenAI(
+        # Initialize one long-lived async OpenAI client with OpenRouter endpoint; the
+        # SDK's default pooled HTTP client keeps connections alive across generations
+        self.client = AsyncOpenAI(
             api_key=self.api_key,
             base_url=config_openrouter.OPENROUTER_BASE_URL
         )
 
         logger.info(f"Initialized ScriptGenerator with model: {self.model}")
 
+    async def aclose(self):
+        """Close the underlying HTTP connection pool."""
+        await self.client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
     def load_thread_data(self, json_file_path: str) -> Optional[List[Dict[str, Any]]]:
         """
         Load thread data from a JSON file.
@@ -55,8 +80,9 @@ class ScriptGenerator:
             List of tweet dictionaries or None if loading failed
         """
         try:
-            with open(json_file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(json_file_path, 'rb') as f:
+                raw = f.read()
+            data = load_json_bytes(raw)
 
             logger.info(f"Loaded {len(data)} tweets from {json_file_path}")
             return data
@@ -100,13 +126,7 @@ class ScriptGenerator:
                 author_desc = ''
             elif isinstance(tweet, dict):
                 # Extract text from various possible fields
-                text = (
-                    tweet.get('text', '') or
-                    tweet.get('replyText', '') or
-                    tweet.get('full_text', '') or
-                    tweet.get('content', '') or
-                    ''
-                ).strip()
+                text = (first_present(tweet, _TWEET_TEXT_KEYS) or '').strip()
 
                 # Extract author information
                 author = tweet.get('author', {}) or tweet.get('user', {})
@@ -159,27 +179,23 @@ class ScriptGenerator:
 
             logger.info(f"Generating script using model: {self.model}")
 
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert TikTok content creator. Always respond with valid JSON."
-                    },
+                    _SYSTEM_MESSAGE,
                     {
                         "role": "user",
                         "content": prompt
                     }
                 ],
-                temperature=0.7,
-                max_tokens=2000
+                **_GENERATION_PARAMS
             )
 
             script_text = response.choices[0].message.content.strip()
 
             # Parse the JSON response
             try:
-                script_data = json.loads(script_text)
+                script_data = load_json_bytes(script_text)
                 logger.info("Successfully generated TikTok script")
                 return script_data
 
@@ -207,8 +223,8 @@ class ScriptGenerator:
             # Ensure output directory exists
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(script_data, f, ensure_ascii=False, indent=2)
+            with open(output_path, 'wb') as f:
+                f.write(dump_json_bytes(script_data))
 
             logger.info(f"Script saved to: {output_path}")
             return True
@@ -228,8 +244,9 @@ class ScriptGenerator:
         Returns:
             Path to the generated script file or None if processing failed
         """
-        # Load thread data
-        thread_data = self.load_thread_data(json_file_path)
+        # Load thread data; file I/O runs in a worker thread so concurrent
+        # generations (batch mode) are not stalled behind the disk
+        thread_data = await asyncio.to_thread(self.load_thread_data, json_file_path)
         if not thread_data:
             return None
 
@@ -253,7 +270,7 @@ class ScriptGenerator:
         output_path = os.path.join(output_dir, output_filename)
 
         # Save script
-        if self.save_script(script_data, output_path):
+        if await asyncio.to_thread(self.save_script, script_data, output_path):
             return output_path
 
         return None
@@ -129,6 +129,28 @@ def test_extract_tweet_text():
     logger.info("extract_tweet_text test passed!")
     return tweet_text
 
+def test_extract_tweet_text_author_fallbacks():
+    """Test author extraction from the alternative scraper formats."""
+    logger.info("Testing extract_tweet_text author fallbacks...")
+    
+    # Twitter Replies Scraper format: author dict without screen_name
+    reply = {"replyId": "1", "author": {"username": "replier", "name": "Replier"}, "replyText": "hi"}
+    assert extract_tweet_text(reply)["postUrl"] == "https://x.com/replier/status/1"
+    
+    # Empty screen_name falls through to the next candidate
+    reply = {"replyId": "2", "author": {"screen_name": "", "name": "named"}}
+    assert extract_tweet_text(reply)["postUrl"] == "https://x.com/named/status/2"
+    
+    # replyUrl takes precedence over a plain string author
+    reply = {"replyId": "3", "replyUrl": "https://x.com/from_url/status/3", "author": "plain"}
+    assert extract_tweet_text(reply)["postUrl"] == "https://x.com/from_url/status/3"
+    
+    # Flat fields are used when nothing else is available
+    reply = {"replyId": "4", "userName": "flat"}
+    assert extract_tweet_text(reply)["postUrl"] == "https://x.com/flat/status/4"
+    
+    logger.info("extract_tweet_text author fallbacks test passed!")
+
 def test_extract_thread_text():
     """Test the extract_thread_text function."""
     logger.info("Testing extract_thread_text function...")
@@ -212,6 +234,9 @@ def main():
     # Test extract_tweet_text
     test_extract_tweet_text()
     
+    # Test author fallbacks
+    test_extract_tweet_text_author_fallbacks()
+    
     # Test extract_thread_text
     test_extract_thread_text()
     
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test script for saving parsed thread data.
+This script replaces the actual download with a stub, so no network access is needed.
+"""
+
+import os
+import shutil
+import logging
+import tempfile
+import video_downloader
+from video_downloader import save_parsed_thread_data
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger('test-video-downloader')
+
+def test_duplicate_video_urls_downloaded_once():
+    """Test that a video URL repeated in a thread is downloaded once and linked for later occurrences."""
+    logger.info("Testing duplicate video URL handling...")
+
+    downloads = []
+
+    def fake_download_video_content(video_url, video_id, output_dir, list_formats=False, output_path=None):
+        downloads.append(video_url)
+        output_path = output_path or os.path.join(output_dir, f"{video_id}.mp4")
+        with open(output_path, 'wb') as f:
+            f.write(b'video bytes')
+        return output_path
+
+    parsed_data = {
+        "user_screen_name": "test_user",
+        "thread_id": "100",
+        "thread_videos": [{"tweet_id": "100", "video_url": "https://video.twimg.com/shared.mp4"}],
+        "replies": [{
+            "reply_id": "101",
+            "reply_videos": [{"tweet_id": "101", "video_url": "https://video.twimg.com/shared.mp4"}]
+        }]
+    }
+
+    output_dir = tempfile.mkdtemp()
+    original_download = video_downloader.download_video_content
+    video_downloader.download_video_content = fake_download_video_content
+    try:
+        saved_files = save_parsed_thread_data(parsed_data, output_dir)
+
+        thread_video = os.path.join(output_dir, "test_user", "100", "videos", "100.mp4")
+        reply_video = os.path.join(output_dir, "test_user", "100", "replies", "101", "videos", "101.mp4")
+
+        assert downloads == ["https://video.twimg.com/shared.mp4"]
+        assert thread_video in saved_files and reply_video in saved_files
+        # The duplicate is a hard link where the filesystem supports it, otherwise a copy
+        with open(reply_video, 'rb') as f:
+            assert f.read() == b'video bytes'
+        if hasattr(os, 'link'):
+            assert os.path.samefile(thread_video, reply_video)
+    finally:
+        video_downloader.download_video_content = original_download
+        shutil.rmtree(output_dir)
+
+    logger.info("Duplicate video URL test passed!")
+
+def main():
+    """Run all tests."""
+    logger.info("Starting video downloader tests...")
+
+    # Test duplicate video URLs
+    test_duplicate_video_urls_downloaded_once()
+
+    logger.info("All tests passed!")
+
+if __name__ == "__main__":
+    main()
@@ -8,13 +8,17 @@ import json
 import logging
 from typing import Dict, List, Any, Optional
 
-# Set up logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+from utils import first_present
+
 logger = logging.getLogger('x-thread-dl.text_extractor')
 
+# Fields that may hold a tweet's ID, in priority order ('replyId' is used by the
+# Twitter Replies Scraper)
+_TWEET_ID_KEYS = (
+    'id_str', 'id', 'tweetId', 'tweet_id', 'postId', 'post_id',
+    'statusId', 'status_id', 'replyId',
+)
+
 def extract_tweet_text(tweet_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
     Extract text and metadata from a tweet.
@@ -34,35 +38,28 @@ def extract_tweet_text(tweet_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
             return None
         
         # Extract tweet ID - check multiple possible field names
-        tweet_id = (
-            tweet_data.get('id_str') or 
-            tweet_data.get('id') or 
-            tweet_data.get('tweetId') or 
-            tweet_data.get('tweet_id') or 
-            tweet_data.get('postId') or 
-            tweet_data.get('post_id') or 
-            tweet_data.get('statusId') or 
-            tweet_data.get('status_id') or
-            tweet_data.get('replyId')  # Added for Twitter Replies Scraper
-        )
+        tweet_id = first_present(tweet_data, _TWEET_ID_KEYS)
         
         if not tweet_id:
             # Log the keys to help diagnose the issue
             logger.error(f"Could not extract tweet ID. Available keys: {list(tweet_data.keys())}")
             return None
         
-        # Extract author information - check multiple possible field structures
+        # Extract author information - check multiple possible field structures.
+        # 'user' and 'author' are looked up once and reused by every check below.
         author = None
-        if 'user' in tweet_data and 'screen_name' in tweet_data['user']:
-            author = tweet_data['user']['screen_name']
-        elif 'author' in tweet_data and isinstance(tweet_data['author'], dict) and 'screen_name' in tweet_data['author']:
-            author = tweet_data['author']['screen_name']
-        elif 'author' in tweet_data and isinstance(tweet_data['author'], dict) and 'username' in tweet_data['author']:
-            author = tweet_data['author']['username']  # Twitter Replies Scraper format
-        elif 'author' in tweet_data and isinstance(tweet_data['author'], dict) and 'name' in tweet_data['author']:
-            author = tweet_data['author']['name']  # Twitter Replies Scraper format
+        user_field = tweet_data.get('user')
+        author_field = tweet_data.get('author')
+        if isinstance(user_field, dict):
+            author = user_field.get('screen_name')
+        if not author and isinstance(author_field, dict):
+            # 'username' and 'name' are the Twitter Replies Scraper format
+            for key in ('screen_name', 'username', 'name'):
+                author = author_field.get(key)
+                if author:
+                    break
         # Try to extract username from replyUrl if available
-        elif 'replyUrl' in tweet_data:
+        if not author and 'replyUrl' in tweet_data:
             try:
                 # Extract username from URL like https://x.com/username/status/123456789
                 url_parts = tweet_data['replyUrl'].split('/')
@@ -72,16 +69,13 @@ def extract_tweet_text(tweet_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
                         author = potential_username
             except Exception as e:
                 logger.debug(f"Error extracting username from replyUrl: {str(e)}")
-        elif 'author' in tweet_data and isinstance(tweet_data['author'], str):
-            author = tweet_data['author']
-        elif 'username' in tweet_data:
-            author = tweet_data['username']
-        elif 'user_screen_name' in tweet_data:
-            author = tweet_data['user_screen_name']
-        elif 'screen_name' in tweet_data:
-            author = tweet_data['screen_name']
-        elif 'userName' in tweet_data:
-            author = tweet_data['userName']
+        if not author and isinstance(author_field, str):
+            author = author_field
+        if not author:
+            for key in ('username', 'user_screen_name', 'screen_name', 'userName'):
+                author = tweet_data.get(key)
+                if author:
+                    break
         
         if not author:
             logger.error(f"Could not extract author for tweet {tweet_id}. Available keys: {list(tweet_data.keys())}")
@@ -205,11 +199,11 @@ def extract_tweet_text(tweet_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         
         # Extract author details
         author_details = {}
-        if 'author' in tweet_data and isinstance(tweet_data['author'], dict):
-            author_details = tweet_data['author']
-        elif 'user' in tweet_data:
+        if isinstance(author_field, dict):
+            author_details = author_field
+        elif isinstance(user_field, dict):
             # Extract relevant user fields
-            user_data = tweet_data['user']
+            user_data = user_field
             author_details = {
                 'followersCount': user_data.get('followers_count'),
                 'favouritesCount': user_data.get('favourites_count'),
@@ -4,36 +4,37 @@ Extracts relevant data from tweets and their replies for structured output.
 """
 
 import logging
+import re
 from typing import Dict, List, Any, Optional
 
 # Import Scraper type for type hinting
 from scraper import Scraper
+from utils import first_present
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO, # Changed to INFO for less verbose default logging
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger('x-thread-dl.thread_parser')
 
+# Fields that may hold a tweet's ID, in priority order. 'rest_id' is often used in
+# newer API responses and 'replyId' in some reply structures.
+_TWEET_ID_KEYS = (
+    'id_str', 'rest_id', 'id', 'tweetId', 'tweet_id', 'postId', 'post_id',
+    'statusId', 'status_id', 'replyId',
+)
+# Keys checked, in priority order, when the author is a nested dict (Apify actors)
+_AUTHOR_DICT_KEYS = ('screen_name', 'username', 'name')
+# Top-level keys that hold the screen name directly in simplified objects or replies
+_AUTHOR_FLAT_KEYS = ('username', 'user_screen_name', 'screen_name', 'userName')
+# Captures the first path segment of an x.com/twitter.com URL (usually the username)
+_REPLY_URL_RE = re.compile(r'[^/]*//(?:x|twitter)\.com/([^/]+)')
+# First path segments that are not usernames ('i' and 'web' are common non-username paths)
+_NON_USERNAME_PATHS = frozenset(('undefined', 'status', 'i', 'web'))
+
 def _extract_tweet_id(tweet_data: Dict[str, Any]) -> Optional[str]:
     """
     Extract the tweet ID from tweet data, checking multiple common fields.
     """
     if not tweet_data:
         return None
-    return (
-        tweet_data.get('id_str') or
-        tweet_data.get('rest_id') or # Often used in newer API responses
-        tweet_data.get('id') or
-        tweet_data.get('tweetId') or
-        tweet_data.get('tweet_id') or
-        tweet_data.get('postId') or
-        tweet_data.get('post_id') or
-        tweet_data.get('statusId') or
-        tweet_data.get('status_id') or
-        tweet_data.get('replyId') # As seen in some reply structures
-    )
+    return first_present(tweet_data, _TWEET_ID_KEYS)
 
 def _extract_author_screen_name(tweet_data: Dict[str, Any]) -> Optional[str]:
     """
@@ -43,52 +44,46 @@ def _extract_author_screen_name(tweet_data: Dict[str, Any]) -> Optional[str]:
     if not tweet_data:
         return None
     try:
+        # Each source is used only if it yields a non-empty string; otherwise the
+        # search moves on to the next one
+        user_field = tweet_data.get('user')
+        author_field = tweet_data.get('author')
+
         # Standard tweet object structure
-        if 'user' in tweet_data and isinstance(tweet_data['user'], dict) and 'screen_name' in tweet_data['user']:
-            return tweet_data['user']['screen_name']
-        
+        if isinstance(user_field, dict):
+            screen_name = user_field.get('screen_name')
+            if screen_name and isinstance(screen_name, str):
+                return screen_name
+
         # Apify actor specific structures (often under 'author')
-        if 'author' in tweet_data and isinstance(tweet_data['author'], dict):
-            author_info = tweet_data['author']
-            return (
-                author_info.get('screen_name') or
-                author_info.get('username') or # Common in replies actor
-                author_info.get('name') # Fallback if screen_name/username not present
-            )
+        if isinstance(author_field, dict):
+            screen_name = first_present(author_field, _AUTHOR_DICT_KEYS, str)
+            if screen_name:
+                return screen_name
 
         # Direct fields (sometimes present in simplified objects or replies)
-        direct_fields = ['username', 'user_screen_name', 'screen_name', 'userName']
-        for field in direct_fields:
-            if field in tweet_data and isinstance(tweet_data[field], str):
-                return tweet_data[field]
-
-        # Fallback: Try to get from 'user_mentions' if it's a self-reply or similar context
-        if 'user_mentions' in tweet_data and isinstance(tweet_data['user_mentions'], list):
-            for mention in tweet_data['user_mentions']:
-                if isinstance(mention, dict) and 'screen_name' in mention:
-                    # This is a heuristic, might need refinement based on typical data
-                    # For now, let's assume if user_mentions is the only source, it might be the author
-                    # This part is speculative and should be tested.
-                    pass # logger.debug("Considering screen_name from user_mentions as a fallback.")
-
-        # Try to extract username from replyUrl if available (often in replies data)
-        if 'replyUrl' in tweet_data and isinstance(tweet_data['replyUrl'], str):
-            url_parts = tweet_data['replyUrl'].split('/')
-            if len(url_parts) >= 4 and url_parts[2] in ['x.com', 'twitter.com']:
-                potential_username = url_parts[3]
-                if potential_username not in ['undefined', 'status', 'i', 'web']: # 'i' and 'web' are common non-username paths
-                    return potential_username
-        
-        # If 'author' is just a string (less common, but possible)
-        if 'author' in tweet_data and isinstance(tweet_data['author'], str):
-            return tweet_data['author']
-
-        logger.debug(f"Could not extract author screen name. Available keys: {list(tweet_data.keys())}")
-        if 'author' in tweet_data:
-            logger.debug(f"Author field details: Type={type(tweet_data['author'])}, Value={str(tweet_data['author'])[:100]}")
-        if 'user' in tweet_data:
-            logger.debug(f"User field details: Type={type(tweet_data['user'])}, Value={str(tweet_data['user'])[:100]}")
-            
+        screen_name = first_present(tweet_data, _AUTHOR_FLAT_KEYS, str)
+        if screen_name:
+            return screen_name
+
+        # Username embedded in replyUrl (often in replies data)
+        reply_url = tweet_data.get('replyUrl')
+        if isinstance(reply_url, str):
+            match = _REPLY_URL_RE.match(reply_url)
+            if match and match.group(1) not in _NON_USERNAME_PATHS:
+                return match.group(1)
+
+        # 'author' is just a string (less common, but possible)
+        if author_field and isinstance(author_field, str):
+            return author_field
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Could not extract author screen name. Available keys: %s", list(tweet_data.keys()))
+            if 'author' in tweet_data:
+                logger.debug("Author field details: Type=%s, Value=%s", type(tweet_data['author']), str(tweet_data['author'])[:100])
+            if 'user' in tweet_data:
+                logger.debug("User field details: Type=%s, Value=%s", type(tweet_data['user']), str(tweet_data['user'])[:100])
+
         return None
     except Exception as e:
         logger.error(f"Error extracting author screen name: {str(e)}", exc_info=True)
@@ -146,30 +141,38 @@ def parse_tweet_and_replies_data(
             "tweet_id": main_tweet_id, # Redundant here but good for consistency if a tweet could have multiple distinct video entries
             "video_url": main_video_url
         })
-        logger.info(f"Found video in main tweet {main_tweet_id}: {main_video_url}")
+        logger.info("Found video in main tweet %s: %s", main_tweet_id, main_video_url)
 
     # Process all replies
     if replies_data is None: # Handle case where replies_data might be None from scraper
         replies_data = []
         logger.warning("Replies data is None, processing as an empty list of replies.")
 
+    # Resolve per-reply callables once instead of on every iteration
+    extract_video_url = scraper.extract_video_url
+    extract_author = _extract_author_screen_name
+    append_reply = parsed_data["replies"].append
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+
     for i, reply_content in enumerate(replies_data):
         if not reply_content:
             logger.warning(f"Skipping empty reply data at index {i}.")
             continue
 
         reply_id = _extract_tweet_id(reply_content)
-        reply_author_screen_name = _extract_author_screen_name(reply_content)
-
         if not reply_id:
+            # Bail out before the author lookup, which is wasted on skipped replies
             logger.warning(f"Could not extract ID for reply at index {i}. Skipping. Data: {str(reply_content)[:200]}")
             continue
+
+        reply_author_screen_name = extract_author(reply_content)
         
         if not reply_author_screen_name:
             logger.warning(f"Could not extract author for reply {reply_id}. Using 'unknown_reply_author'. Data: {str(reply_content)[:200]}")
             reply_author_screen_name = "unknown_reply_author"
         
-        logger.debug(f"Processing reply {reply_id} by {reply_author_screen_name}")
+        if debug_enabled:
+            logger.debug("Processing reply %s by %s", reply_id, reply_author_screen_name)
 
         reply_struct = {
             "reply_id": reply_id,
@@ -178,15 +181,15 @@ def parse_tweet_and_replies_data(
             "reply_videos": []
         }
 
-        reply_video_url = scraper.extract_video_url(reply_content)
+        reply_video_url = extract_video_url(reply_content)
         if reply_video_url:
             reply_struct["reply_videos"].append({
                 "tweet_id": reply_id, # ID of the reply tweet itself
                 "video_url": reply_video_url
             })
-            logger.info(f"Found video in reply {reply_id}: {reply_video_url}")
+            logger.info("Found video in reply %s: %s", reply_id, reply_video_url)
         
-        parsed_data["replies"].append(reply_struct)
+        append_reply(reply_struct)
 
     logger.info(f"Finished parsing. Found {len(parsed_data['thread_videos'])} video(s) in main thread, and {len(parsed_data['replies'])} replies processed.")
     total_reply_videos = sum(len(r['reply_videos']) for r in parsed_data['replies'])
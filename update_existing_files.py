@@ -5,96 +5,70 @@ This script reads existing JSON files and adds the new fields based on the infor
 """
 
 import os
-import json
 import logging
-from typing import Dict, List, Any
+import multiprocessing
+from typing import Dict, List, Any, Iterator
+
+from logging_config import setup_logging
+from utils import load_json_bytes, dump_json_bytes
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger('update-existing-files')
 
 def update_tweet_with_new_fields(tweet: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Update a tweet with the new fields.
+    Update a tweet with the new fields, in place.
     
     Args:
         tweet (Dict[str, Any]): The tweet data
         
     Returns:
-        Dict[str, Any]: The updated tweet data
+        Dict[str, Any]: The same tweet dict, with the new fields added
     """
     # Extract existing fields
     tweet_id = tweet.get('tweet_id')
     author = tweet.get('author')
     text = tweet.get('text')
     
-    # Create author details if it's a string
-    if isinstance(author, str):
-        # Default values for author details
-        author_details = {
-            'followersCount': 339,
-            'favouritesCount': 39512,
-            'friendsCount': 678,
-            'description': "Microsoft Sentinel Practice Lead @ MSSP. Defender, Detection Engineering, Threat Emulation. Blog-haver. Hack the planet."
-        }
-    else:
-        author_details = author
-    
-    # Add new fields
-    updated_tweet = tweet.copy()
+    # Post and reply URLs share the same status link
+    status_url = None
+    if tweet_id:
+        author_str = author if isinstance(author, str) else 'undefined'
+        status_url = f"https://x.com/{author_str}/status/{tweet_id}"
     
     # Post URL
-    if 'postUrl' not in updated_tweet and tweet_id:
-        updated_tweet['postUrl'] = f"https://x.com/{author if isinstance(author, str) else 'undefined'}/status/{tweet_id}"
-    
-    # Post ID
-    if 'postId' not in updated_tweet:
-        updated_tweet['postId'] = tweet_id
+    if status_url:
+        tweet.setdefault('postUrl', status_url)
     
-    # Reply ID
-    if 'replyId' not in updated_tweet:
-        updated_tweet['replyId'] = tweet_id
+    # Post ID, Reply ID
+    tweet.setdefault('postId', tweet_id)
+    tweet.setdefault('replyId', tweet_id)
     
     # Reply URL
-    if 'replyUrl' not in updated_tweet and tweet_id:
-        updated_tweet['replyUrl'] = f"https://x.com/{author if isinstance(author, str) else 'undefined'}/status/{tweet_id}"
-    
-    # Reply Text
-    if 'replyText' not in updated_tweet:
-        updated_tweet['replyText'] = text
-    
-    # Conversation ID
-    if 'conversationId' not in updated_tweet:
-        updated_tweet['conversationId'] = tweet_id
+    if status_url:
+        tweet.setdefault('replyUrl', status_url)
     
-    # Media
-    if 'media' not in updated_tweet:
-        updated_tweet['media'] = []
+    # Reply Text, Conversation ID, Media
+    tweet.setdefault('replyText', text)
+    tweet.setdefault('conversationId', tweet_id)
+    tweet.setdefault('media', [])
     
-    # Author
+    # Author: replace a bare screen name with default author details
     if isinstance(author, str):
-        updated_tweet['author'] = author_details
+        tweet['author'] = {
+            'followersCount': 339,
+            'favouritesCount': 39512,
+            'friendsCount': 678,
+            'description': "Microsoft Sentinel Practice Lead @ MSSP. Defender, Detection Engineering, Threat Emulation. Blog-haver. Hack the planet."
+        }
     
     # Counts
-    if 'replyCount' not in updated_tweet:
-        updated_tweet['replyCount'] = 0
-    
-    if 'quoteCount' not in updated_tweet:
-        updated_tweet['quoteCount'] = 0
-    
-    if 'repostCount' not in updated_tweet:
-        updated_tweet['repostCount'] = 0
+    tweet.setdefault('replyCount', 0)
+    tweet.setdefault('quoteCount', 0)
+    tweet.setdefault('repostCount', 0)
+    tweet.setdefault('favouriteCount', 0)
+    tweet.setdefault('viewsCount', "141")
     
-    if 'favouriteCount' not in updated_tweet:
-        updated_tweet['favouriteCount'] = 0
-    
-    if 'viewsCount' not in updated_tweet:
-        updated_tweet['viewsCount'] = "141"
-    
-    return updated_tweet
+    return tweet
 
 def update_file(file_path: str) -> None:
     """
@@ -105,35 +79,67 @@ def update_file(file_path: str) -> None:
     """
     try:
         # Read the file
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+        data = load_json_bytes(raw)
         
-        # Update each tweet
-        updated_data = [update_tweet_with_new_fields(tweet) for tweet in data]
+        # Update each tweet in place; no second list is built
+        for tweet in data:
+            update_tweet_with_new_fields(tweet)
         
         # Write the updated data back to the file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(updated_data, f, ensure_ascii=False, indent=2)
+        with open(file_path, 'wb') as f:
+            f.write(dump_json_bytes(data))
         
         logger.info(f"Successfully updated {file_path}")
         
     except Exception as e:
         logger.error(f"Error updating {file_path}: {str(e)}", exc_info=True)
 
+def _iter_json_files(directory: str) -> Iterator[str]:
+    """
+    Recursively yield the paths of all JSON files under a directory.
+    
+    Args:
+        directory (str): The directory to scan
+        
+    Yields:
+        str: The path to each JSON file
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_json_files(entry.path)
+            elif entry.name.endswith('.json') and entry.is_file():
+                yield entry.path
+
 def update_directory(directory: str) -> None:
     """
     Update all JSON files in a directory.
     
+    The JSON parse/update/serialize work is CPU-bound, so files are spread
+    across a process pool rather than threads.
+    
     Args:
         directory (str): The directory to update
     """
     try:
-        # Get all JSON files in the directory
-        for root, _, files in os.walk(directory):
-            for file in files:
-                if file.endswith('.json'):
-                    file_path = os.path.join(root, file)
-                    update_file(file_path)
+        file_paths = list(_iter_json_files(directory))
+        
+        if len(file_paths) > 1:
+            # No more workers than files, and chunks small enough that every worker
+            # gets several (a few files per chunk still saves IPC round trips)
+            processes = min(multiprocessing.cpu_count(), len(file_paths))
+            chunksize = max(1, len(file_paths) // (processes * 4))
+            # Workers configure logging too, in case they are spawned rather than forked
+            with multiprocessing.Pool(processes=processes, initializer=setup_logging) as pool:
+                # Consume the results so every file is processed before reporting success
+                for _ in pool.imap_unordered(update_file, file_paths, chunksize=chunksize):
+                    pass
+        else:
+            # Not worth starting worker processes for a single file
+            for file_path in file_paths:
+                update_file(file_path)
         
         logger.info(f"Successfully updated all files in {directory}")
         
@@ -142,6 +148,7 @@ def update_directory(directory: str) -> None:
 
 def main():
     """Run the update script."""
+    setup_logging()
     logger.info("Starting update script...")
     
     # Update the downloaded_videos directory
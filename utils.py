@@ -0,0 +1,52 @@
+"""
+Shared helpers for the x-thread-dl tool.
+"""
+
+from typing import Dict, Any, Optional, Tuple, Union
+
+import orjson
+
+# 2-space indented output, with non-string dict keys (e.g. ints) converted to strings
+_JSON_DUMP_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+def first_present(data: Dict[str, Any], keys: Tuple[str, ...], value_type: Optional[type] = None) -> Optional[Any]:
+    """
+    Return the first truthy value found in `data` for the given keys, in order.
+
+    Args:
+        data (Dict[str, Any]): The dictionary to search (e.g. tweet data).
+        keys (Tuple[str, ...]): Candidate keys, in priority order.
+        value_type (Optional[type]): If given, values of other types are skipped.
+
+    Returns:
+        Optional[Any]: The first truthy value, or None if no key has one.
+    """
+    for key in keys:
+        value = data.get(key)
+        if value and (value_type is None or isinstance(value, value_type)):
+            return value
+    return None
+
+def load_json_bytes(raw: Union[bytes, str]) -> Any:
+    """
+    Parse JSON from bytes (e.g. a file read in 'rb' mode) or a string.
+
+    Args:
+        raw (Union[bytes, str]): The JSON document.
+
+    Returns:
+        Any: The parsed data. Malformed input raises json.JSONDecodeError.
+    """
+    return orjson.loads(raw)
+
+def dump_json_bytes(data: Any) -> bytes:
+    """
+    Serialize data to indented UTF-8 JSON, ready to be written in 'wb' mode with a single write.
+
+    Args:
+        data (Any): The data to serialize.
+
+    Returns:
+        bytes: The JSON document, indented by 2 spaces with non-ASCII characters kept as-is.
+    """
+    return orjson.dumps(data, option=_JSON_DUMP_OPTIONS)
@@ -5,34 +5,115 @@ and saving text content.
 """
 
 import os
-import json
+import atexit
 import logging
+import queue
+import shutil
+import threading
 import yt_dlp
-from typing import Optional, Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Optional, Dict, List, Any, Set, Tuple, Iterator
 
 # Import configuration
 import config # To get DEFAULT_OUTPUT_DIR
+from utils import dump_json_bytes
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO, # Changed to INFO
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Logging is configured by the application entry point (main.py)
 logger = logging.getLogger('x-thread-dl.media_downloader') # Renamed logger
 
+# Maximum number of videos downloaded concurrently for one thread
+_MAX_DOWNLOAD_WORKERS = 8
+
+# Bounds how many downloads talk to X.com at once, independently of the pool size,
+# so parallel downloads do not trigger HTTP 429 retry storms
+_X_REQUEST_SLOTS = threading.Semaphore(config.DOWNLOAD_CONCURRENCY)
+
+# Directories already created (or found to exist) during this run
+_DIR_CACHE: Set[str] = set()
+
+# yt-dlp options shared by every video download; the per-video 'outtmpl' is set
+# on the borrowed YoutubeDL instance
+_YDL_BASE_OPTS = {
+    # Enhanced format selection for better quality
+    # Priority: 4K video + audio > best video + audio > best single file
+    'format': (
+        'bestvideo[height<=2160][ext=mp4]+bestaudio[ext=m4a]/'  # 4K MP4 + M4A audio
+        'bestvideo[ext=mp4]+bestaudio[ext=m4a]/'                # Best MP4 + M4A audio
+        'best[ext=mp4]/'                                        # Best single MP4 file
+        'best'                                                  # Fallback to any best format
+    ),
+    'quiet': False, # Set to False to see yt-dlp output, True for silent
+    'no_warnings': False,
+    'ignoreerrors': True,
+    'nooverwrites': False, # Allow overwriting for retries or updates
+    'retries': 5,
+    'logger': logger, # Pass our logger to yt-dlp
+    'merge_output_format': 'mp4',  # Ensure final output is MP4
+    'http_chunk_size': 10 * 1024 * 1024,  # Fetch plain HTTP downloads in 10 MB ranged requests
+    'concurrent_fragment_downloads': 4,  # Download HLS/DASH fragments of one video in parallel
+    # Consider adding user agent if facing blocks:
+    # 'http_headers': {'User-Agent': 'Mozilla/5.0 ...'}
+}
+
+# yt-dlp options for metadata-only extraction (format listing)
+_YDL_INFO_OPTS = {
+    'quiet': True,
+    'no_warnings': True,
+    'ignoreerrors': True,
+}
+
+# Idle YoutubeDL instances. Building one initializes extractors, cookies and HTTP
+# handlers, so instances are reused across downloads. With `requests` installed,
+# yt-dlp's preferred request handler keeps a pooled session per instance, so
+# reuse also keeps connections to video.twimg.com alive between videos.
+# A YoutubeDL is not safe to share between threads, so each concurrent
+# download borrows its own.
+_IDLE_YDLS: "queue.SimpleQueue[yt_dlp.YoutubeDL]" = queue.SimpleQueue()
+
+@contextmanager
+def _borrow_ydl(output_path: str) -> Iterator[yt_dlp.YoutubeDL]:
+    """Borrow a reusable YoutubeDL configured to write to output_path."""
+    try:
+        ydl = _IDLE_YDLS.get_nowait()
+    except queue.Empty:
+        ydl = yt_dlp.YoutubeDL(dict(_YDL_BASE_OPTS))
+    ydl.params['outtmpl']['default'] = output_path
+    try:
+        yield ydl
+    finally:
+        _IDLE_YDLS.put(ydl)
+
+@atexit.register
+def _close_idle_ydls():
+    """Close pooled YoutubeDL instances (and their HTTP connections) at exit."""
+    while True:
+        try:
+            ydl = _IDLE_YDLS.get_nowait()
+        except queue.Empty:
+            break
+        ydl.close()
+
 def _ensure_dir_exists(dir_path: str):
     """Ensure directory exists, creating it if necessary."""
-    if not os.path.exists(dir_path):
-        os.makedirs(dir_path)
-        logger.debug(f"Created directory: {dir_path}")
+    if dir_path in _DIR_CACHE:
+        return
+    # exist_ok makes this a single idempotent call, also safe across download threads
+    os.makedirs(dir_path, exist_ok=True)
+    _DIR_CACHE.add(dir_path)
+    logger.debug("Ensured directory exists: %s", dir_path)
 
 def _save_json_content(data: Dict[str, Any], file_path: str):
-    """Saves dictionary data as JSON to the specified file path."""
+    """Saves dictionary data as JSON to the specified file path.
+
+    The parent directory must already exist; save_parsed_thread_data creates it.
+    """
     try:
-        _ensure_dir_exists(os.path.dirname(file_path))
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
-        logger.info(f"Successfully saved JSON content to {file_path}")
+        # Serialize in one shot so the file is written with a single write() call
+        # rather than one small write per JSON token
+        with open(file_path, 'wb') as f:
+            f.write(dump_json_bytes(data))
+        logger.info("Successfully saved JSON content to %s", file_path)
     except Exception as e:
         logger.error(f"Error saving JSON content to {file_path}: {str(e)}", exc_info=True)
 
@@ -49,32 +130,28 @@ def list_video_formats(video_url: str) -> Optional[List[Dict[str, Any]]]:
     try:
         logger.info(f"Listing available formats for: {video_url}")
 
-        ydl_opts = {
-            'quiet': True,
-            'no_warnings': True,
-            'ignoreerrors': True,
-            'listformats': True,
-        }
-
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        # yt-dlp fills in defaults on the params dict it is given, so pass a copy
+        with _X_REQUEST_SLOTS, yt_dlp.YoutubeDL(dict(_YDL_INFO_OPTS)) as ydl:
             info = ydl.extract_info(video_url, download=False)
-            if info and 'formats' in info:
-                formats = info['formats']
-                logger.info(f"Found {len(formats)} available formats")
+        if info and 'formats' in info:
+            formats = info['formats']
+            logger.info(f"Found {len(formats)} available formats")
+            # Skip the walk over every format unless its output would be emitted
+            if logger.isEnabledFor(logging.DEBUG):
                 for fmt in formats:
-                    logger.debug(f"Format: {fmt.get('format_id', 'N/A')} - "
-                               f"Quality: {fmt.get('height', 'N/A')}p - "
-                               f"Ext: {fmt.get('ext', 'N/A')} - "
-                               f"Bitrate: {fmt.get('tbr', 'N/A')} - "
-                               f"Codec: {fmt.get('vcodec', 'N/A')}")
-                return formats
+                    logger.debug("Format: %s - Quality: %sp - Ext: %s - Bitrate: %s - Codec: %s",
+                                 fmt.get('format_id', 'N/A'), fmt.get('height', 'N/A'),
+                                 fmt.get('ext', 'N/A'), fmt.get('tbr', 'N/A'),
+                                 fmt.get('vcodec', 'N/A'))
+            return formats
         return None
 
     except Exception as e:
         logger.error(f"Error listing formats for {video_url}: {str(e)}", exc_info=True)
         return None
 
-def download_video_content(video_url: str, video_id: str, output_dir: str, list_formats: bool = False) -> Optional[str]:
+def download_video_content(video_url: str, video_id: str, output_dir: str, list_formats: bool = False,
+                           output_path: Optional[str] = None) -> Optional[str]:
     """
     Download a single video using yt-dlp with enhanced quality options.
     The filename will be {video_id}.mp4.
@@ -84,68 +161,59 @@ def download_video_content(video_url: str, video_id: str, output_dir: str, list_
         video_id (str): The ID of the tweet/reply containing the video (used for filename).
         output_dir (str): The directory to save the video to.
         list_formats (bool): Whether to list available formats before downloading.
+        output_path (Optional[str]): Precomputed {output_dir}/{video_id}.mp4 path. When given,
+            the caller is responsible for having created output_dir.
 
     Returns:
         Optional[str]: The path to the downloaded video or None if download failed.
     """
     try:
-        _ensure_dir_exists(output_dir)
-
-        output_filename = f"{video_id}.mp4"
-        output_path = os.path.join(output_dir, output_filename)
-
-        logger.info(f"Downloading video from {video_url} to {output_path}")
-
-        # List formats if requested
-        if list_formats:
-            formats = list_video_formats(video_url)
-            if formats:
-                logger.info(f"Available formats for video {video_id}:")
-                for fmt in formats[:10]:  # Show first 10 formats
-                    logger.info(f"  {fmt.get('format_id', 'N/A')}: {fmt.get('height', 'N/A')}p "
-                              f"{fmt.get('ext', 'N/A')} {fmt.get('tbr', 'N/A')}kbps")
-
-        # Enhanced format selection for better quality
-        # Priority: 4K video + audio > best video + audio > best single file
-        ydl_opts = {
-            'format': (
-                'bestvideo[height<=2160][ext=mp4]+bestaudio[ext=m4a]/'  # 4K MP4 + M4A audio
-                'bestvideo[ext=mp4]+bestaudio[ext=m4a]/'                # Best MP4 + M4A audio
-                'best[ext=mp4]/'                                        # Best single MP4 file
-                'best'                                                  # Fallback to any best format
-            ),
-            'outtmpl': output_path,
-            'quiet': False, # Set to False to see yt-dlp output, True for silent
-            'no_warnings': False,
-            'ignoreerrors': True,
-            'nooverwrites': False, # Allow overwriting for retries or updates
-            'retries': 5,
-            'logger': logger, # Pass our logger to yt-dlp
-            'merge_output_format': 'mp4',  # Ensure final output is MP4
-            # Consider adding user agent if facing blocks:
-            # 'http_headers': {'User-Agent': 'Mozilla/5.0 ...'}
-        }
-
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            # Extract info to log selected format
-            try:
-                info = ydl.extract_info(video_url, download=False)
-                if info:
-                    if 'format' in info:
-                        logger.info(f"Selected format for {video_id}: {info.get('format', 'Unknown')}")
-                    if 'height' in info:
-                        logger.info(f"Video resolution: {info.get('height', 'Unknown')}p")
-                    if 'tbr' in info:
-                        logger.info(f"Total bitrate: {info.get('tbr', 'Unknown')} kbps")
-            except Exception as e:
-                logger.debug(f"Could not extract format info: {e}")
-
-            # Download the video
-            ydl.download([video_url])
-
-        if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
-            file_size = os.path.getsize(output_path) / (1024 * 1024)  # Size in MB
-            logger.info(f"Successfully downloaded video to {output_path} ({file_size:.1f} MB)")
+        if output_path is None:
+            _ensure_dir_exists(output_dir)
+            output_path = os.path.join(output_dir, f"{video_id}.mp4")
+
+        logger.info("Downloading video from %s to %s", video_url, output_path)
+
+        with _X_REQUEST_SLOTS, _borrow_ydl(output_path) as ydl:
+            # Extract the metadata once without processing it; it already lists every
+            # available format, so they can be shown before downloading
+            info = ydl.extract_info(video_url, download=False, process=False)
+            if info:
+                # List formats if requested
+                formats = info.get('formats') if list_formats else None
+                if formats and logger.isEnabledFor(logging.INFO):
+                    logger.info(f"Available formats for video {video_id}:")
+                    for fmt in formats[:10]:  # Show first 10 formats
+                        logger.info("  %s: %sp %s %skbps",
+                                    fmt.get('format_id', 'N/A'), fmt.get('height', 'N/A'),
+                                    fmt.get('ext', 'N/A'), fmt.get('tbr', 'N/A'))
+                # Select a format and download from the metadata extracted above; the
+                # returned info describes the selected format
+                try:
+                    info = ydl.process_ie_result(info, download=True)
+                except (yt_dlp.utils.DownloadError, yt_dlp.utils.ExtractorError) as e:
+                    # Unlike extract_info, process_ie_result is not covered by yt-dlp's
+                    # ignoreerrors handling, so report its message the way yt-dlp would
+                    # (one line, no traceback) and give up on this video
+                    logger.error("%s", e)
+                    return None
+
+        if info:
+            if 'format' in info:
+                logger.info("Selected format for %s: %s", video_id, info.get('format', 'Unknown'))
+            if 'height' in info:
+                logger.info("Video resolution: %sp", info.get('height', 'Unknown'))
+            if 'tbr' in info:
+                logger.info("Total bitrate: %s kbps", info.get('tbr', 'Unknown'))
+
+        # A single stat answers both "does it exist" and "is it non-empty"
+        try:
+            file_size = os.stat(output_path).st_size
+        except FileNotFoundError:
+            file_size = 0
+        if file_size > 0:
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Successfully downloaded video to %s (%.1f MB)", output_path, file_size / (1024 * 1024))
             return output_path
         else:
             # yt-dlp with ignoreerrors might not raise an exception but still fail
@@ -161,6 +229,35 @@ def download_video_content(video_url: str, video_id: str, output_dir: str, list_
         logger.error(f"Error downloading video {video_id} from {video_url}: {str(e)}", exc_info=True)
         return None
 
+def _link_or_copy(src_path: str, dest_path: str) -> Optional[str]:
+    """
+    Place a copy of an already downloaded video at dest_path without re-downloading it.
+    A hard link is used where possible, falling back to a file copy.
+
+    Args:
+        src_path (str): Path to the downloaded video.
+        dest_path (str): Path where the duplicate video should appear.
+
+    Returns:
+        Optional[str]: dest_path on success, None if it could not be created.
+    """
+    try:
+        try:
+            os.link(src_path, dest_path)
+        except FileExistsError:
+            # Left over from an earlier run; replace it
+            os.remove(dest_path)
+            os.link(src_path, dest_path)
+    except OSError:
+        # Hard links are unsupported here (e.g. cross-device or FAT), so copy instead
+        try:
+            shutil.copyfile(src_path, dest_path)
+        except Exception as e:
+            logger.error("Error copying video %s to %s: %s", src_path, dest_path, e, exc_info=True)
+            return None
+    logger.info("Reused downloaded video %s for %s", src_path, dest_path)
+    return dest_path
+
 def save_parsed_thread_data(parsed_data: Dict[str, Any], base_output_dir: str = config.DEFAULT_OUTPUT_DIR, list_formats: bool = False) -> List[str]:
     """
     Saves all parsed thread data (text and videos) according to the structured format:
@@ -196,16 +293,19 @@ def save_parsed_thread_data(parsed_data: Dict[str, Any], base_output_dir: str =
         _save_json_content(thread_text_content, thread_text_path)
         saved_files.append(thread_text_path)
 
-    # 2. Download main thread videos
+    # Videos are collected as (video_url, video_id, output_dir, output_path) jobs and
+    # downloaded concurrently once all text content has been written. Target paths
+    # are joined once here rather than again inside each download.
+    download_jobs = []
+
+    # 2. Queue main thread videos
     thread_videos_path = os.path.join(thread_path, "videos")
+    # Use main thread_id for its videos, as video_info.tweet_id is the same
+    thread_video_path = os.path.join(thread_videos_path, f"{thread_id}.mp4")
     for video_info in parsed_data.get("thread_videos", []):
         video_url = video_info.get("video_url")
-        # Use main thread_id for its videos, as video_info.tweet_id is the same
-        video_id_for_filename = thread_id
-        if video_url and video_id_for_filename:
-            downloaded_path = download_video_content(video_url, video_id_for_filename, thread_videos_path, list_formats=list_formats)
-            if downloaded_path:
-                saved_files.append(downloaded_path)
+        if video_url and thread_id:
+            download_jobs.append((video_url, thread_id, thread_videos_path, thread_video_path))
 
     # 3. Process replies
     replies_base_path = os.path.join(thread_path, "replies")
@@ -226,16 +326,52 @@ def save_parsed_thread_data(parsed_data: Dict[str, Any], base_output_dir: str =
             _save_json_content(reply_text_content, reply_text_path)
             saved_files.append(reply_text_path)
 
-        # 3b. Download reply videos
+        # 3b. Queue reply videos
         reply_videos_path = os.path.join(current_reply_path, "videos")
         for video_info in reply_info.get("reply_videos", []):
             video_url = video_info.get("video_url")
             # video_info.tweet_id here is actually the reply_id
             video_id_for_filename = video_info.get("tweet_id", reply_id)
             if video_url and video_id_for_filename:
-                downloaded_path = download_video_content(video_url, video_id_for_filename, reply_videos_path, list_formats=list_formats)
+                download_jobs.append((video_url, video_id_for_filename, reply_videos_path,
+                                      os.path.join(reply_videos_path, f"{video_id_for_filename}.mp4")))
+
+    # The same video can appear more than once in a thread (quotes, re-embeds);
+    # download each URL once and reuse the file for later occurrences
+    unique_jobs: Dict[str, Tuple[str, str, str]] = {}
+    duplicate_jobs = []
+    for video_url, video_id, output_dir, output_path in download_jobs:
+        if video_url in unique_jobs:
+            duplicate_jobs.append((video_url, output_dir, output_path))
+        else:
+            unique_jobs[video_url] = (video_id, output_dir, output_path)
+
+    # 4. Download all queued videos; downloads are network-bound, so they overlap well on threads
+    downloaded_paths: Dict[str, str] = {}
+    if unique_jobs:
+        with ThreadPoolExecutor(max_workers=min(_MAX_DOWNLOAD_WORKERS, len(unique_jobs))) as executor:
+            futures = {}
+            for video_url, (video_id, output_dir, output_path) in unique_jobs.items():
+                _ensure_dir_exists(output_dir)
+                future = executor.submit(download_video_content, video_url, video_id, output_dir,
+                                         list_formats=list_formats, output_path=output_path)
+                futures[future] = video_url
+            for future in as_completed(futures):
+                downloaded_path = future.result()
                 if downloaded_path:
+                    downloaded_paths[futures[future]] = downloaded_path
                     saved_files.append(downloaded_path)
 
+    # 5. Link duplicate videos to the copy that was downloaded
+    for video_url, output_dir, duplicate_path in duplicate_jobs:
+        source_path = downloaded_paths.get(video_url)
+        if not source_path:
+            continue
+        if duplicate_path == source_path:
+            continue
+        _ensure_dir_exists(output_dir)
+        if _link_or_copy(source_path, duplicate_path):
+            saved_files.append(duplicate_path)
+
     logger.info(f"Finished processing and saving data for thread {user_screen_name}/{thread_id}. Total files saved/downloaded: {len(saved_files)}")
     return saved_files